@@ -1,25 +1,54 @@
 import random
+import time
 import numpy as np
 
+class SearchAborted(Exception):
+    """Raised inside the search when the node or time budget runs out."""
+
 class AIPlayer:
     """
     AI player that uses the Minimax algorithm to make decisions.
     """
-    def __init__(self, player_num=2, difficulty='medium'):
+    WIN_SCORE = 10000
+    ASPIRATION_WINDOW = 25  # Half-width of the root window around the last score
+    NULL_WINDOW = 1  # Width of the zero-window probes
+    TIME_CHECK_INTERVAL = 256  # Nodes between clock reads when a time limit is set
+    
+    SEARCH_MODES = ('pvs', 'mtdf')
+    
+    # Transposition table bound flags
+    EXACT, LOWER, UPPER = 0, 1, 2
+    
+    # Difficulty levels: (max depth, node budget per move, root score noise)
+    DIFFICULTY_LEVELS = {
+        'easy': (1, 50, 8.0),
+        'medium': (3, 300, 3.0),
+        'hard': (4, 1000, 1.0),
+        'expert': (6, 6000, 0.0)
+    }
+    
+    def __init__(self, player_num=2, difficulty='medium', search_mode='pvs', time_limit=None, cache=None,
+                 telemetry=None):
         self.player_num = player_num  # AI player number (usually 2)
         self.opponent_num = 1 if player_num == 2 else 2
+        if search_mode not in self.SEARCH_MODES:
+            raise ValueError(f"Unknown search mode {search_mode!r}, expected one of {self.SEARCH_MODES}")
+        self.search_mode = search_mode
+        self.time_limit = time_limit  # Optional seconds per move, on top of the node budget
+        self.cache = cache  # Optional PositionCache shared across games and processes
+        self.telemetry = telemetry  # Optional Telemetry recording think time per move
         self.set_difficulty(difficulty)
+        self.reset_search()
     
     def set_difficulty(self, difficulty):
-        """Set the AI difficulty level by adjusting minimax depth."""
-        difficulty_levels = {
-            'easy': 1,     # Reduced from 2 to 1
-            'medium': 3,   # Reduced from 4 to 3
-            'hard': 4,     # Reduced from 5 to 4
-            'expert': 6
-        }
-        self.depth = difficulty_levels.get(difficulty.lower(), 3)
+        """
+        Set the AI difficulty level. Each level caps the search depth and the
+        number of nodes searched per move, and sets how much noise is added to
+        the root scores when picking a move.
+        """
         self.difficulty = difficulty.lower()
+        self.depth, self.node_budget, self.noise = self.DIFFICULTY_LEVELS.get(
+            self.difficulty, self.DIFFICULTY_LEVELS['medium'])
         return self.depth
     
     def get_move(self, board):
@@ -27,6 +56,20 @@ class AIPlayer:
         Uses the minimax algorithm to choose the best move.
         Returns the column to drop the piece.
         """
+        if self.telemetry is None:
+            return self.choose_move(board)
+        
+        start = time.perf_counter()
+        col = self.choose_move(board)
+        ply = self.telemetry.ply_range(int(np.count_nonzero(board.board)))
+        self.telemetry.observe('ai_move_seconds', time.perf_counter() - start,
+                               difficulty=self.difficulty, ply=ply)
+        self.telemetry.observe('ai_move_nodes', self.nodes, difficulty=self.difficulty)
+        return col
+    
+    def choose_move(self, board):
+        """Picks a column for the current difficulty, see get_move."""
+        self.reset_search()
         valid_moves = board.get_valid_moves()
         if not valid_moves:
             return None
@@ -47,27 +90,16 @@ class AIPlayer:
             if random.random() < random_factor:
                 return random.choice(valid_moves)
         
-        best_score = float('-inf')
-        best_col = random.choice(valid_moves)  # Default to random valid move
+        if self.noise == 0.0:
+            # Without noise only the best move matters, so bounds are enough
+            return self.iterative_deepening(board, self.depth)
         
-        # Try each valid column and pick the one with the best score
+        # Add a random factor to the scored candidates to make the AI less perfect
+        scores = self.score_moves(board, self.depth)
+        best_score = float('-inf')
+        best_col = valid_moves[0]
         for col in valid_moves:
-            # Make a copy of the board
-            temp_board = board.copy()
-            temp_board.drop_piece(col, self.player_num)
-            
-            # Get score for this move
-            score = self.minimax(temp_board, self.depth - 1, False, float('-inf'), float('inf'))
-            
-            # Add a large random factor for lower difficulties to make the AI less perfect
-            if self.difficulty == 'easy':
-                score += random.uniform(-8.0, 8.0)
-            elif self.difficulty == 'medium':
-                score += random.uniform(-3.0, 3.0)
-            elif self.difficulty == 'hard':
-                score += random.uniform(-1.0, 1.0)
-            
-            # Update best move if this score is better
+            score = scores[col] + random.uniform(-self.noise, self.noise)
             if score > best_score:
                 best_score = score
                 best_col = col
@@ -84,48 +116,239 @@ class AIPlayer:
         
         return best_col
     
-    def minimax(self, board, depth, is_maximizing, alpha, beta):
+    def reset_search(self):
+        """Clears the per-move search state (node counter, budget and transposition table)."""
+        self.nodes = 0
+        self.abortable = False  # The depth 1 pass always runs to completion
+        self.deadline = None
+        if self.time_limit is not None:
+            self.deadline = time.perf_counter() + self.time_limit
+        self.transpositions = {}
+        self.best_moves = {}
+    
+    def check_budget(self):
+        """Aborts the running search once the node or time budget is spent."""
+        if not self.abortable:
+            return
+        if self.nodes >= self.node_budget:
+            raise SearchAborted()
+        if (self.deadline is not None and self.nodes % self.TIME_CHECK_INTERVAL == 0
+                and time.perf_counter() > self.deadline):
+            raise SearchAborted()
+    
+    def score_moves(self, board, depth):
         """
-        Minimax algorithm with alpha-beta pruning.
-        Returns the best score for the current board position.
+        Scores every valid move with a full-window search, deepening one ply at
+        a time until depth is reached or the budget runs out.
+        Returns a dict of column -> score from the deepest completed pass.
+        """
+        scores = {}
+        for d in range(1, depth + 1):
+            try:
+                current = {}
+                for col in board.get_valid_moves():
+                    temp_board = board.copy()
+                    temp_board.drop_piece(col, self.player_num)
+                    current[col] = -self.negamax(temp_board, d - 1, float('-inf'), float('inf'), -1)
+            except SearchAborted:
+                break
+            scores = current
+            self.abortable = True
+        return scores
+    
+    def iterative_deepening(self, board, depth):
         """
+        Searches depth 1..depth, each pass seeded with the previous score, until
+        depth is reached or the budget runs out.
+        Returns the best column from the deepest completed pass.
+        """
+        # A position searched before (or its mirror image) is answered straight
+        # from the cache
+        if self.cache is not None:
+            cached = self.cache.get(board, depth, self.player_num)
+            if cached is not None and cached[0] == self.EXACT and board.is_valid_move(cached[2]):
+                return cached[2]
+        
+        best_col = None
+        score = None
+        for d in range(1, depth + 1):
+            try:
+                if self.search_mode == 'mtdf':
+                    score, best_col = self.mtdf(board, d, score or 0)
+                else:
+                    score, best_col = self.aspiration_search(board, d, score)
+            except SearchAborted:
+                break
+            self.abortable = True
+            if self.cache is not None:
+                self.cache.put(board, d, self.player_num, self.EXACT, score, best_col)
+        return best_col
+    
+    def aspiration_search(self, board, depth, guess=None):
+        """
+        Root search with an aspiration window around guess, widened and
+        re-searched whenever the score falls outside it.
+        Returns (score, column).
+        """
+        if guess is None or abs(guess) >= self.WIN_SCORE:
+            alpha, beta = float('-inf'), float('inf')
+        else:
+            alpha = guess - self.ASPIRATION_WINDOW
+            beta = guess + self.ASPIRATION_WINDOW
+        
+        while True:
+            score, best_col = self.search_root(board, depth, alpha, beta)
+            if score <= alpha:
+                alpha = float('-inf')  # Fail low, widen downwards
+            elif score >= beta:
+                beta = float('inf')  # Fail high, widen upwards
+            else:
+                return score, best_col
+    
+    def mtdf(self, board, depth, guess=0):
+        """
+        MTD(f): converges on the root score with zero-width searches only,
+        relying on the transposition table to make the repeated passes cheap.
+        Returns (score, column).
+        """
+        value = guess
+        lower, upper = float('-inf'), float('inf')
+        while lower < upper:
+            beta = value + self.NULL_WINDOW if value == lower else value
+            value = self.negamax(board, depth, beta - self.NULL_WINDOW, beta, 1)
+            if value < beta:
+                upper = value
+            else:
+                lower = value
+        
+        # The first column (in board order) reaching the root score is the move
+        # the full-window search would have picked
+        for col in board.get_valid_moves():
+            temp_board = board.copy()
+            temp_board.drop_piece(col, self.player_num)
+            score = -self.negamax(temp_board, depth - 1, -value, -value + self.NULL_WINDOW, -1)
+            if score >= value:
+                return value, col
+        return value, board.get_valid_moves()[0]
+    
+    def search_root(self, board, depth, alpha, beta):
+        """
+        Principal variation search at the root. The first move gets the full
+        (alpha, beta) window and the rest are zero-width probes, re-searched on
+        fail-high. Moves are tried in column order so ties resolve to the
+        leftmost column, exactly like the plain minimax loop.
+        Returns (score, column); a score outside (alpha, beta) is only a bound.
+        """
+        best_score = float('-inf')
+        best_col = None
+        for col in board.get_valid_moves():
+            temp_board = board.copy()
+            temp_board.drop_piece(col, self.player_num)
+            
+            if best_col is None:
+                score = -self.negamax(temp_board, depth - 1, -beta, -alpha, -1)
+            else:
+                score = -self.negamax(temp_board, depth - 1, -alpha - self.NULL_WINDOW, -alpha, -1)
+                if alpha < score < beta:
+                    score = -self.negamax(temp_board, depth - 1, -beta, -alpha, -1)
+            
+            if score > best_score:
+                best_score = score
+                best_col = col
+            if score >= beta:
+                break  # Fail high, the caller re-searches with a wider window
+            alpha = max(alpha, score)
+        return best_score, best_col
+    
+    def negamax(self, board, depth, alpha, beta, color):
+        """
+        Negamax principal variation search with alpha-beta pruning.
+        color is 1 when the AI is to move and -1 for the opponent; the returned
+        score is from the point of view of the side to move (fail-soft).
+        """
+        self.check_budget()
+        self.nodes += 1
+        
         # Check terminal conditions
         winner = board.get_winner()
         if winner is not None:
             if winner == self.player_num:
-                return 10000  # AI wins
+                return self.WIN_SCORE * color  # AI wins
             elif winner == 0:
                 return 0  # Draw
             else:
-                return -10000  # Human wins
+                return -self.WIN_SCORE * color  # Human wins
         
         if depth == 0:
-            return self.evaluate_board(board)
+            return self.evaluate_board(board) * color
         
-        valid_moves = board.get_valid_moves()
+        key = (board.board.tobytes(), color)
+        entry = self.transpositions.get((key, depth))
+        if entry is None and self.cache is not None:
+            cached = self.cache.get(board, depth, self.player_num * color)
+            if cached is not None:
+                flag, value, move = cached
+                entry = self.transpositions[(key, depth)] = (flag, value)
+                self.best_moves.setdefault(key, move)
+        if entry is not None:
+            flag, value = entry
+            if flag == self.EXACT:
+                return value
+            if flag == self.LOWER and value >= beta:
+                return value
+            if flag == self.UPPER and value <= alpha:
+                return value
         
-        if is_maximizing:  # AI's turn (maximizing)
-            value = float('-inf')
-            for col in valid_moves:
-                temp_board = board.copy()
-                temp_board.drop_piece(col, self.player_num)
-                score = self.minimax(temp_board, depth - 1, False, alpha, beta)
-                value = max(value, score)
-                alpha = max(alpha, value)
-                if alpha >= beta:
-                    break  # Beta cutoff
-            return value
-        else:  # Human's turn (minimizing)
-            value = float('inf')
-            for col in valid_moves:
-                temp_board = board.copy()
-                temp_board.drop_piece(col, self.opponent_num)
-                score = self.minimax(temp_board, depth - 1, True, alpha, beta)
-                value = min(value, score)
-                beta = min(beta, value)
-                if alpha >= beta:
-                    break  # Alpha cutoff
-            return value
+        # Order moves so the previous best comes first, then from the center out
+        valid_moves = sorted(board.get_valid_moves(), key=lambda c: abs(c - board.cols // 2))
+        hint = self.best_moves.get(key)
+        if hint in valid_moves:
+            valid_moves.remove(hint)
+            valid_moves.insert(0, hint)
+        
+        piece = self.player_num if color == 1 else self.opponent_num
+        alpha_orig = alpha
+        value = float('-inf')
+        best_col = valid_moves[0]
+        for i, col in enumerate(valid_moves):
+            temp_board = board.copy()
+            temp_board.drop_piece(col, piece)
+            
+            if i == 0:
+                score = -self.negamax(temp_board, depth - 1, -beta, -alpha, -color)
+            else:
+                # Null-window probe: only prove the move is no better than alpha
+                score = -self.negamax(temp_board, depth - 1, -alpha - self.NULL_WINDOW, -alpha, -color)
+                if alpha < score < beta:
+                    score = -self.negamax(temp_board, depth - 1, -beta, -alpha, -color)
+            
+            if score > value:
+                value = score
+                best_col = col
+            alpha = max(alpha, value)
+            if alpha >= beta:
+                break  # Beta cutoff
+        
+        if value <= alpha_orig:
+            flag = self.UPPER
+        elif value >= beta:
+            flag = self.LOWER
+        else:
+            flag = self.EXACT
+        self.transpositions[(key, depth)] = (flag, value)
+        self.best_moves[key] = best_col
+        if self.cache is not None:
+            self.cache.put(board, depth, self.player_num * color, flag, value, best_col)
+        return value
+    
+    def minimax(self, board, depth, is_maximizing, alpha, beta):
+        """
+        Minimax algorithm with alpha-beta pruning.
+        Returns the best score for the current board position.
+        """
+        if is_maximizing:
+            return self.negamax(board, depth, alpha, beta, 1)
+        return -self.negamax(board, depth, -beta, -alpha, -1)
     
     def evaluate_board(self, board):
         """
@@ -134,49 +357,41 @@ class AIPlayer:
         """
         score = 0
         
-        # Apply difficulty factor - easier levels evaluate the board less accurately
-        difficulty_factor = {
-            'easy': 0.1,
-            'medium': 0.3,
-            'hard': 0.6,
-            'expert': 1.0
-        }.get(self.difficulty, 1.0)
-        
         # Score center column higher (control of center is advantageous)
         center_col = board.cols // 2
         center_array = [int(i) for i in list(board.board[:, center_col])]
         center_count = center_array.count(self.player_num)
-        score += center_count * 3 * difficulty_factor
+        score += center_count * 3
         
         # Score horizontal windows
         for row in range(board.rows):
             row_array = [int(i) for i in list(board.board[row, :])]
             for col in range(board.cols - 3):
                 window = row_array[col:col+4]
-                score += self.evaluate_window(window, difficulty_factor)
+                score += self.evaluate_window(window)
         
         # Score vertical windows
         for col in range(board.cols):
             col_array = [int(i) for i in list(board.board[:, col])]
             for row in range(board.rows - 3):
                 window = col_array[row:row+4]
-                score += self.evaluate_window(window, difficulty_factor)
+                score += self.evaluate_window(window)
         
         # Score positive diagonal windows
         for row in range(board.rows - 3):
             for col in range(board.cols - 3):
                 window = [board.board[row+i][col+i] for i in range(4)]
-                score += self.evaluate_window(window, difficulty_factor)
+                score += self.evaluate_window(window)
         
         # Score negative diagonal windows
         for row in range(3, board.rows):
             for col in range(board.cols - 3):
                 window = [board.board[row-i][col+i] for i in range(4)]
-                score += self.evaluate_window(window, difficulty_factor)
+                score += self.evaluate_window(window)
         
         return score
     
-    def evaluate_window(self, window, difficulty_factor=1.0):
+    def evaluate_window(self, window):
         """
         Evaluates a window of 4 positions and returns a score.
         This function implements the evaluation function described in requirements.
@@ -190,15 +405,14 @@ class AIPlayer:
         if ai_count == 4:
             score += 100  # Winning position
         elif ai_count == 3 and empty_count == 1:
-            score += 5 * difficulty_factor    # Potential win (3 in a row)
+            score += 5    # Potential win (3 in a row)
         elif ai_count == 2 and empty_count == 2:
-            score += 2 * difficulty_factor    # Build-up (2 in a row)
+            score += 2    # Build-up (2 in a row)
         
         # Penalize opponent's potential wins more severely
-        # Lower difficulties are less likely to block winning moves
         if opponent_count == 3 and empty_count == 1:
-            score -= 8 * difficulty_factor    # Block opponent's potential win
+            score -= 8    # Block opponent's potential win
         elif opponent_count == 2 and empty_count == 2:
-            score -= 2 * difficulty_factor    # Block opponent's build-up
+            score -= 2    # Block opponent's build-up
         
         return score
\ No newline at end of file
@@ -0,0 +1,151 @@
+import numpy as np
+from board import Board
+
+class BoardBatch:
+    """
+    N Connect Four games stored in one (N, rows, cols) NumPy array so moves,
+    win checks and evaluation run for every game at once. Follows the Board
+    API, with arrays of per-game values in place of scalars.
+    """
+    ONGOING = -1  # Winner value for games that are not over yet
+    
+    def __init__(self, n, rows=6, cols=7):
+        self.n = n
+        self.rows = rows
+        self.cols = cols
+        self.boards = np.zeros((n, rows, cols), dtype=np.int8)
+        self.heights = np.zeros((n, cols), dtype=np.int8)  # Pieces per column
+        self.last_moves = np.full((n, 2), -1, dtype=np.int8)  # (row, col), -1 before any move
+        self._windows = self._window_indices(rows, cols)
+    
+    @staticmethod
+    def _window_indices(rows, cols):
+        """
+        Returns a (W, 4) array with the flat cell indices of every line of
+        four: horizontal, vertical, positive and negative diagonals, in the
+        same order AIPlayer.evaluate_board visits them.
+        """
+        cells = np.arange(rows * cols).reshape(rows, cols)
+        windows = []
+        for row in range(rows):
+            for col in range(cols - 3):
+                windows.append(cells[row, col:col + 4])
+        for col in range(cols):
+            for row in range(rows - 3):
+                windows.append(cells[row:row + 4, col])
+        for row in range(rows - 3):
+            for col in range(cols - 3):
+                windows.append([cells[row + i, col + i] for i in range(4)])
+        for row in range(3, rows):
+            for col in range(cols - 3):
+                windows.append([cells[row - i, col + i] for i in range(4)])
+        return np.array(windows)
+    
+    @classmethod
+    def from_boards(cls, boards):
+        """Creates a batch holding copies of the given Board objects."""
+        if not boards:
+            raise ValueError("from_boards needs at least one board")
+        batch = cls(len(boards), boards[0].rows, boards[0].cols)
+        for i, board in enumerate(boards):
+            batch.boards[i] = board.board
+            if board.last_move is not None:
+                batch.last_moves[i] = board.last_move
+        batch.heights[:] = np.count_nonzero(batch.boards, axis=1)
+        return batch
+    
+    def to_board(self, i):
+        """Returns game i as a Board."""
+        board = Board(self.rows, self.cols)
+        board.board = self.boards[i].astype(int)
+        if self.last_moves[i, 0] >= 0:
+            board.last_move = tuple(int(x) for x in self.last_moves[i])
+        return board
+    
+    def copy(self):
+        """Returns a copy of the batch."""
+        new_batch = BoardBatch(self.n, self.rows, self.cols)
+        new_batch.boards = self.boards.copy()
+        new_batch.heights = self.heights.copy()
+        new_batch.last_moves = self.last_moves.copy()
+        return new_batch
+    
+    def reset(self, games=None):
+        """Resets all games, or only those selected by an index or boolean array."""
+        if games is None:
+            games = slice(None)
+        self.boards[games] = 0
+        self.heights[games] = 0
+        self.last_moves[games] = -1
+    
+    def valid_moves_mask(self):
+        """Returns an (N, cols) boolean array of the columns each game can play."""
+        return self.heights < self.rows
+    
+    def drop_pieces(self, cols, players):
+        """
+        Drops one piece per game: cols[i] for player players[i] (a single
+        column or player number applies to every game). Games given an
+        invalid or negative column are left unchanged.
+        Returns an (N,) boolean array of the games where the move was made.
+        """
+        cols = np.broadcast_to(np.asarray(cols), (self.n,))
+        players = np.broadcast_to(np.asarray(players, dtype=np.int8), (self.n,))
+        games = np.arange(self.n)
+        
+        in_range = (cols >= 0) & (cols < self.cols)
+        safe_cols = np.where(in_range, cols, 0)
+        heights = self.heights[games, safe_cols]
+        ok = in_range & (heights < self.rows)
+        
+        games, safe_cols, heights = games[ok], safe_cols[ok], heights[ok]
+        rows = self.rows - 1 - heights
+        self.boards[games, rows, safe_cols] = players[ok]
+        self.heights[games, safe_cols] += 1
+        self.last_moves[games, 0] = rows
+        self.last_moves[games, 1] = safe_cols
+        return ok
+    
+    def check_win(self, player):
+        """Returns an (N,) boolean array of the games the player has won."""
+        cells = self.boards.reshape(self.n, -1) == player
+        return cells[:, self._windows].all(axis=2).any(axis=1)
+    
+    def is_full(self):
+        """Returns an (N,) boolean array of the games with a full board."""
+        return (self.heights == self.rows).all(axis=1)
+    
+    def get_winners(self):
+        """
+        Returns an (N,) array with the winner of each game: 1 or 2, 0 for a
+        draw and ONGOING for games that are not over yet.
+        """
+        winners = np.full(self.n, self.ONGOING, dtype=np.int8)
+        winners[self.is_full()] = 0
+        winners[self.check_win(2)] = 2
+        winners[self.check_win(1)] = 1
+        return winners
+    
+    def is_game_over(self):
+        """Returns an (N,) boolean array of the games that are over."""
+        return self.get_winners() != self.ONGOING
+    
+    def evaluate(self, player):
+        """
+        Scores every game for the player with the same heuristic as
+        AIPlayer.evaluate_board. Returns an (N,) integer array.
+        """
+        opponent = 1 if player == 2 else 2
+        flat = self.boards.reshape(self.n, -1)
+        windows = flat[:, self._windows]  # (N, W, 4)
+        own = np.count_nonzero(windows == player, axis=2)
+        other = np.count_nonzero(windows == opponent, axis=2)
+        empty = 4 - own - other
+        
+        scores = np.count_nonzero(self.boards[:, :, self.cols // 2] == player, axis=1) * 3
+        window_scores = (100 * (own == 4)
+                         + 5 * ((own == 3) & (empty == 1))
+                         + 2 * ((own == 2) & (empty == 2))
+                         - 8 * ((other == 3) & (empty == 1))
+                         - 2 * ((other == 2) & (empty == 2)))
+        return scores + window_scores.sum(axis=1)
@@ -0,0 +1,170 @@
+import os
+import numpy as np
+
+class PositionCache:
+    """
+    Fixed-size cache of searched positions stored in a memory-mapped file.
+    Positions are keyed under left-right mirror symmetry, so a position and
+    its mirror image share one entry. Any number of processes can open the
+    same file read-only while a single process writes to it.
+    """
+    # The file starts with a 16-byte header identifying it as a cache
+    HEADER_DTYPE = np.dtype([('magic', '<u8'), ('version', '<u4'), ('entries', '<u4')])
+    MAGIC = int.from_bytes(b'C4POSCCH', 'little')
+    VERSION = 1
+
+    # Each entry is 16 bytes: the key XOR-ed with the data (so a torn write
+    # from a concurrent writer never matches) followed by the packed data
+    ENTRY_DTYPE = np.dtype([('check', '<u8'), ('data', '<u8')])
+    BUCKET_SIZE = 2  # Slot 0 keeps the deepest search, slot 1 always gets replaced
+    MIN_DEPTH = 2  # Shallower results are cheaper to recompute than to store
+
+    def __init__(self, path, entries=1 << 20, readonly=False):
+        """
+        Opens the cache file at path, creating it with room for the given
+        number of entries if it does not exist yet. An existing file keeps
+        its own size. Raises ValueError if the file is not a cache file.
+        """
+        self.path = path
+        self.readonly = readonly
+        if not readonly and not os.path.exists(path):
+            self.create(path, entries)
+        entries = self.read_header(path)
+        self.table = np.memmap(path, dtype=self.ENTRY_DTYPE, mode='r' if readonly else 'r+',
+                               offset=self.HEADER_DTYPE.itemsize, shape=(entries,))
+        self.buckets = entries // self.BUCKET_SIZE
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def create(cls, path, entries):
+        """Creates an empty cache file with room for the given number of entries."""
+        entries -= entries % cls.BUCKET_SIZE
+        if entries < cls.BUCKET_SIZE:
+            raise ValueError(f"A position cache needs at least {cls.BUCKET_SIZE} entries")
+        header = np.array([(cls.MAGIC, cls.VERSION, entries)], dtype=cls.HEADER_DTYPE)
+        with open(path, 'wb') as f:
+            header.tofile(f)
+            f.truncate(cls.HEADER_DTYPE.itemsize + entries * cls.ENTRY_DTYPE.itemsize)
+
+    @classmethod
+    def read_header(cls, path):
+        """
+        Checks the header of a cache file and returns its number of entries.
+        Raises ValueError if the file is not a cache file of this version.
+        """
+        size = os.path.getsize(path)
+        if size < cls.HEADER_DTYPE.itemsize:
+            raise ValueError(f"{path} is not a position cache file")
+        header = np.fromfile(path, dtype=cls.HEADER_DTYPE, count=1)[0]
+        if int(header['magic']) != cls.MAGIC:
+            raise ValueError(f"{path} is not a position cache file")
+        if int(header['version']) != cls.VERSION:
+            raise ValueError(f"{path} has cache format version {int(header['version'])}, expected {cls.VERSION}")
+        entries = int(header['entries'])
+        if (entries < cls.BUCKET_SIZE or entries % cls.BUCKET_SIZE
+                or size != cls.HEADER_DTYPE.itemsize + entries * cls.ENTRY_DTYPE.itemsize):
+            raise ValueError(f"{path} is a damaged position cache file")
+        return entries
+
+    @staticmethod
+    def position_keys(board):
+        """
+        Returns (key, mirror_key) for the board. Each column is encoded as
+        its player 1 pieces plus a marker bit just above the top piece, which
+        makes the key unique for any board with cols * (rows + 1) <= 64.
+        """
+        shift = board.rows + 1
+        if board.cols * shift > 64:
+            raise ValueError(f"PositionCache does not support {board.rows}x{board.cols} boards")
+        stones = board.board[::-1]  # Bottom row first
+        heights = np.count_nonzero(stones, axis=0)
+        weights = 1 << np.arange(board.rows)
+        codes = (stones == 1).T.astype(np.int64).dot(weights) + (1 << heights)
+
+        key = mirror_key = 0
+        for col, code in enumerate(codes.tolist()):
+            key |= code << (col * shift)
+            mirror_key |= code << ((board.cols - 1 - col) * shift)
+        return key, mirror_key
+
+    def _bucket(self, key):
+        """Returns the index of the first slot of the bucket for key."""
+        mixed = (key * 0x9E3779B97F4A7C15) & 0xFFFFFFFFFFFFFFFF
+        return (mixed >> 16) % self.buckets * self.BUCKET_SIZE
+
+    @staticmethod
+    def _pack(depth, owner, flag, value, move):
+        """Packs an entry into 64 bits: value, depth, flag, move and owner."""
+        return ((int(value) & 0xFFFFFFFF)
+                | (depth & 0xFF) << 32
+                | (flag & 0xFF) << 40
+                | ((move + 1) & 0xFF) << 48
+                | (owner & 0xFF) << 56)
+
+    @staticmethod
+    def _unpack(data):
+        """Inverse of _pack, returns (depth, owner, flag, value, move)."""
+        value = data & 0xFFFFFFFF
+        if value >= 1 << 31:
+            value -= 1 << 32
+        owner = data >> 56
+        if owner >= 1 << 7:
+            owner -= 1 << 8
+        return (data >> 32) & 0xFF, owner, (data >> 40) & 0xFF, value, ((data >> 48) & 0xFF) - 1
+
+    def get(self, board, depth, owner):
+        """
+        Looks up a search result for board at exactly this depth. owner tells
+        whose point of view the value is from (see AIPlayer.negamax).
+        Returns (flag, value, move) with move mapped back onto this board,
+        or None when the position is not cached.
+        """
+        key, mirror_key = self.position_keys(board)
+        mirrored = mirror_key < key
+        key = min(key, mirror_key)
+
+        start = self._bucket(key)
+        for slot in range(start, start + self.BUCKET_SIZE):
+            check, data = (int(x) for x in self.table[slot].tolist())
+            if data == 0 or check ^ data != key:
+                continue
+            entry_depth, entry_owner, flag, value, move = self._unpack(data)
+            if entry_depth == depth and entry_owner == owner:
+                self.hits += 1
+                if mirrored and move >= 0:
+                    move = board.cols - 1 - move
+                return flag, value, move
+        self.misses += 1
+        return None
+
+    def put(self, board, depth, owner, flag, value, move):
+        """
+        Stores a search result. Slot 0 of the bucket is only replaced by an
+        equal or deeper search; everything else goes to slot 1.
+        """
+        if self.readonly or depth < self.MIN_DEPTH:
+            return
+        key, mirror_key = self.position_keys(board)
+        if mirror_key < key:
+            key = mirror_key
+            move = board.cols - 1 - move
+
+        data = self._pack(depth, owner, flag, value, move)
+        start = self._bucket(key)
+        old_data = int(self.table[start]['data'])
+        if old_data == 0 or depth >= self._unpack(old_data)[0]:
+            slot = start
+        else:
+            slot = start + 1
+        self.table[slot] = (key ^ data, data)
+
+    def flush(self):
+        """Writes pending changes to disk."""
+        if not self.readonly:
+            self.table.flush()
+
+    def close(self):
+        """Flushes and releases the memory-mapped file."""
+        self.flush()
+        self.table = None
@@ -1,46 +1,98 @@
 import os
+import sys
 import time
 
 class CliUI:
     """
     Command-line interface for the Connect Four game.
+    Frames are drawn with ANSI cursor control: the first frame is written in
+    full, later frames only rewrite the cells that changed, and every frame
+    goes out in a single write. In spectator mode both sides are played by
+    the AI and the UI never waits for input.
     """
-    def __init__(self, board):
+    TITLE_LINES = 3  # Blank line, title, blank line
+    
+    def __init__(self, board, spectator=False, delay=0.0, games=1, out=None, telemetry=None):
         self.board = board
+        self.telemetry = telemetry  # Optional Telemetry recording frame times
+        self.spectator = spectator
+        self.delay = delay  # Seconds to pause after each move in spectator mode
+        self.games_left = games  # Games to play in spectator mode
+        self.out = out or sys.stdout
+        self.ansi = self.out.isatty()  # Plain full frames when output is piped
+        self.drawn_board = None  # Board object the last frame showed
+        self.drawn_cells = None  # Cell contents of the last frame
+        if self.ansi and os.name == 'nt':
+            self.ansi = self.enable_windows_ansi()
+    
+    @staticmethod
+    def enable_windows_ansi():
+        """
+        Turns on ANSI escape processing in the Windows console. Returns False
+        if the console does not support it, so plain frames are used instead.
+        """
+        import ctypes
+        from ctypes import wintypes
+        ENABLE_VIRTUAL_TERMINAL_PROCESSING = 0x0004
+        STD_OUTPUT_HANDLE = -11
+        kernel32 = ctypes.WinDLL('kernel32', use_last_error=True)
+        handle = kernel32.GetStdHandle(STD_OUTPUT_HANDLE)
+        mode = wintypes.DWORD()
+        if not kernel32.GetConsoleMode(handle, ctypes.byref(mode)):
+            return False
+        return bool(kernel32.SetConsoleMode(handle, mode.value | ENABLE_VIRTUAL_TERMINAL_PROCESSING))
+    
+    def write(self, text):
+        """Writes text to the terminal in one call."""
+        self.out.write(text)
+        self.out.flush()
     
-    def clear_screen(self):
-        """Clears the console screen."""
-        os.system('cls' if os.name == 'nt' else 'clear')
+    def cell_char(self, row, col):
+        """Returns the character for a cell."""
+        if self.board.board[row][col] == 0:
+            return "."
+        elif self.board.board[row][col] == 1:
+            return "X"  # Human player (red in GUI)
+        else:
+            return "O"  # AI player (yellow in GUI)
+    
+    def board_lines(self):
+        """Returns the lines of a full frame."""
+        lines = ["", "Connect Four", ""]
+        lines.append("  " + "".join(str(col + 1) + " " for col in range(self.board.cols)))
+        for row in range(self.board.rows):
+            lines.append("| " + "".join(self.cell_char(row, col) + " " for col in range(self.board.cols)) + "|")
+        lines.append("  " + "= " * self.board.cols)
+        lines.append("")
+        return lines
     
     def draw_board(self):
         """Draws the current state of the board in the terminal."""
-        self.clear_screen()
-        print("\nConnect Four\n")
+        start = time.perf_counter()
+        cells = [[self.cell_char(row, col) for col in range(self.board.cols)]
+                 for row in range(self.board.rows)]
         
-        # Print column numbers
-        header = "  "
-        for col in range(self.board.cols):
-            header += str(col + 1) + " "
-        print(header)
+        if not self.ansi:
+            self.write("\n".join(self.board_lines()) + "\n")
+        elif self.drawn_cells is None or self.drawn_board is not self.board:
+            self.write("\033[H\033[2J" + "\n".join(self.board_lines()) + "\n")
+        else:
+            # Rewrite only the changed cells, then clear the prompt area below
+            # the board so the cursor is back where a full frame leaves it
+            frame = []
+            first_row = self.TITLE_LINES + 2  # Terminal rows are 1-based, after the header
+            for row in range(self.board.rows):
+                for col in range(self.board.cols):
+                    if cells[row][col] != self.drawn_cells[row][col]:
+                        frame.append(f"\033[{first_row + row};{3 + 2 * col}H{cells[row][col]}")
+            frame.append(f"\033[{first_row + self.board.rows + 2};1H\033[J")
+            self.write("".join(frame))
         
-        # Print board
-        for row in range(self.board.rows):
-            row_str = "| "
-            for col in range(self.board.cols):
-                if self.board.board[row][col] == 0:
-                    row_str += ". "
-                elif self.board.board[row][col] == 1:
-                    row_str += "X "  # Human player (red in GUI)
-                else:
-                    row_str += "O "  # AI player (yellow in GUI)
-            row_str += "|"
-            print(row_str)
+        self.drawn_board = self.board
+        self.drawn_cells = cells
         
-        # Print bottom border
-        footer = "  "
-        for col in range(self.board.cols):
-            footer += "= "
-        print(footer + "\n")
+        if self.telemetry is not None:
+            self.telemetry.observe('frame_seconds', time.perf_counter() - start, ui='cli', kind='draw_board')
     
     def get_human_move(self):
         """Gets a move from the human player via command line."""
@@ -58,19 +110,53 @@ class CliUI:
     
     def animate_piece_drop(self, col, row, player):
         """Simple animation effect for CLI."""
-        # No complex animation in CLI mode
-        pass
+        # No complex animation in CLI mode, spectators just get a pause per move
+        if self.spectator and self.delay:
+            time.sleep(self.delay)
     
     def display_winner(self, winner):
         """Displays who won the game."""
-        print("\n" + "=" * 30)
-        if winner == 1:
-            print("You win! Congratulations!")
+        if self.spectator:
+            message = {1: "X wins!", 2: "O wins!"}.get(winner, "It's a draw!")
+        elif winner == 1:
+            message = "You win! Congratulations!"
         elif winner == 2:
-            print("AI wins! Better luck next time!")
+            message = "AI wins! Better luck next time!"
         else:
-            print("It's a draw!")
-        print("=" * 30 + "\n")
+            message = "It's a draw!"
+        self.write("\n" + "=" * 30 + "\n" + message + "\n" + "=" * 30 + "\n\n")
+    
+    def replay(self, moves):
+        """
+        Replays a recorded game from its 1-based move list, a string such as
+        "4453" or a sequence of column numbers, drawing a frame per move
+        without waiting for input.
+        Returns the winner, or None if the game did not finish.
+        """
+        self.board.reset()
+        self.draw_board()
+        player = 1
+        winner = None
+        for i, move in enumerate(moves):
+            col = int(move) - 1 if str(move).isdecimal() else -1
+            if not self.board.drop_piece(col, player):
+                self.write(f"Invalid move in replay: {move}\n")
+                return None
+            self.animate_piece_drop(col, self.board.last_move[0], player)
+            self.draw_board()
+            player = 3 - player
+            
+            # Stop at the end of the game rather than playing on an impossible board
+            winner = self.board.get_winner()
+            if winner is not None:
+                extra = moves[i + 1:]
+                if extra:
+                    self.write(f"Game over after move {i + 1}, ignoring the remaining moves: {extra}\n")
+                break
+        
+        if winner is not None:
+            self.display_winner(winner)
+        return winner
     
     def show_difficulty_selection(self):
         """Shows a difficulty selection prompt."""
@@ -93,5 +179,10 @@ class CliUI:
     
     def handle_game_end(self):
         """Handles the end-of-game state and returns whether to restart."""
+        if self.spectator:
+            self.games_left -= 1
+            time.sleep(self.delay)
+            return self.games_left > 0
+        
         restart = input("Play again? (y/n): ").lower().startswith('y')
         return restart
\ No newline at end of file
@@ -1,3 +1,4 @@
+import time
 from board import Board
 from ai import AIPlayer
 from player import HumanPlayer
@@ -6,13 +7,23 @@ class Game:
     """
     Main game controller class that coordinates the game flow.
     """
-    def __init__(self, ui, ai_difficulty='medium'):
-        """Initialize the game with the given UI and difficulty."""
+    def __init__(self, ui, ai_difficulty='medium', ai_cache=None, spectate=False, telemetry=None):
+        """
+        Initialize the game with the given UI and difficulty. ai_cache is an
+        optional PositionCache that keeps search results between games. With
+        spectate the AI plays both sides. telemetry is an optional Telemetry
+        that records move and game timings and is exported when a game ends.
+        """
         self.board = Board()
         self.ui = ui
         self.ui.board = self.board  # Connect the UI to the board
-        self.human = HumanPlayer(player_num=1)
-        self.ai = AIPlayer(player_num=2, difficulty=ai_difficulty)
+        self.spectate = spectate
+        if spectate:
+            self.human = AIPlayer(player_num=1, difficulty=ai_difficulty, cache=ai_cache, telemetry=telemetry)
+        else:
+            self.human = HumanPlayer(player_num=1)
+        self.ai = AIPlayer(player_num=2, difficulty=ai_difficulty, cache=ai_cache, telemetry=telemetry)
+        self.telemetry = telemetry
         self.current_player = 1  # Human starts
     
     def start(self):
@@ -20,6 +31,7 @@ class Game:
         # Reset game state
         self.board.reset()
         self.current_player = 1
+        start_time = time.perf_counter()
         
         # Show initial board
         self.ui.draw_board()
@@ -28,7 +40,9 @@ class Game:
         game_over = False
         while not game_over:
             # Get the current player's move
-            if self.current_player == 1:  # Human's turn
+            if self.current_player == 1 and self.spectate:  # AI playing the human's side
+                col = self.human.get_move(self.board)
+            elif self.current_player == 1:  # Human's turn
                 col = self.human.get_move(self.board, self.ui)
             else:  # AI's turn
                 col = self.ai.get_move(self.board)
@@ -52,5 +66,11 @@ class Game:
                     # Switch turns
                     self.current_player = 3 - self.current_player  # Switch between 1 and 2
         
+        if self.telemetry is not None:
+            winner = self.board.get_winner()
+            self.telemetry.observe('game_seconds', time.perf_counter() - start_time,
+                                   difficulty=self.ai.difficulty, winner=winner)
+            self.telemetry.export()
+        
         # Game is over, let the UI handle restart logic
         return self.ui.handle_game_end()
\ No newline at end of file
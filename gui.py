@@ -21,8 +21,9 @@ class GameUI:
     GREEN = (0, 255, 31)
     PURPLE = (75, 0, 130)
     
-    def __init__(self, board, square_size=100):
+    def __init__(self, board, square_size=100, telemetry=None):
         self.board = board
+        self.telemetry = telemetry  # Optional Telemetry recording frame times
         self.square_size = square_size
         self.radius = square_size // 2 - 5
         self.width = board.cols * square_size
@@ -70,6 +71,7 @@ class GameUI:
     # Rest of the code remains unchanged
     def draw_board(self):
         """Draws the current state of the board."""
+        start = time.perf_counter()
         self.screen.fill(self.BLACK)
         
         # Draw drop area (top row)
@@ -109,6 +111,9 @@ class GameUI:
                                     (self.board.rows + 0.7) * self.square_size))
         
         pygame.display.update()
+        
+        if self.telemetry is not None:
+            self.telemetry.observe('frame_seconds', time.perf_counter() - start, ui='gui', kind='draw_board')
     
     def draw_hovering_piece(self, col, player):
         """Draws a hovering piece above the specified column."""
@@ -128,6 +133,7 @@ class GameUI:
     
     def animate_piece_drop(self, col, row, player):
         """Animates a piece dropping into position."""
+        start = time.perf_counter()
         color = self.PLAYER_COLOR if player == 1 else self.AI_COLOR
         
         # Clear the top position first
@@ -161,6 +167,9 @@ class GameUI:
                                   self.radius)
             
             pygame.time.wait(50)  # Animation speed
+        
+        if self.telemetry is not None:
+            self.telemetry.observe('frame_seconds', time.perf_counter() - start, ui='gui', kind='animate_piece_drop')
     
     def display_winner(self, winner):
         """Displays who won the game."""
@@ -1,3 +1,4 @@
+import os
 import sys
 import argparse
 from board import Board
@@ -5,17 +6,47 @@ from ai import AIPlayer
 from player import HumanPlayer
 from gui import GameUI
 from cli import CliUI
+from cache import PositionCache
+from telemetry import Telemetry
 from game import Game
 
 def parse_arguments():
     """Parse command line arguments to determine game mode."""
     parser = argparse.ArgumentParser(description='Connect Four Game')
     parser.add_argument('--cli', action='store_true', help='Run in command-line interface mode')
-    return parser.parse_args()
+    parser.add_argument('--cache', metavar='PATH', help='Keep AI search results in this file between games')
+    parser.add_argument('--cache-readonly', action='store_true', help='Use the cache file without writing to it')
+    parser.add_argument('--spectate', action='store_true', help='Watch the AI play itself in the terminal (implies --cli)')
+    parser.add_argument('--replay', metavar='MOVES', help='Replay a game from its 1-based moves, e.g. 4453 (implies --cli)')
+    parser.add_argument('--games', type=int, default=1, help='Number of games to watch in spectator mode')
+    parser.add_argument('--delay', type=float, default=0.5, help='Seconds between moves in spectator and replay mode')
+    parser.add_argument('--telemetry', metavar='PATH',
+                        help='Export move and frame timing histograms to PATH (.json, otherwise Prometheus text)')
+    parser.add_argument('--telemetry-interval', type=float, metavar='SECONDS',
+                        help='Also export telemetry at most every SECONDS, when something is recorded')
+    parser.add_argument('--difficulty', choices=['easy', 'medium', 'hard', 'expert'], help='AI difficulty instead of asking')
+    args = parser.parse_args()
+    
+    if args.games < 1:
+        parser.error('--games must be at least 1')
+    
+    # A read-only cache can only be opened, never created
+    if args.cache_readonly and not args.cache:
+        parser.error('--cache-readonly requires --cache PATH')
+    if args.cache_readonly and not os.path.exists(args.cache):
+        parser.error(f'--cache-readonly: cache file {args.cache} does not exist')
+    if args.cache and os.path.exists(args.cache):
+        try:
+            PositionCache.read_header(args.cache)
+        except ValueError as e:
+            parser.error(f'--cache: {e}')
+    return args
 
 def main():
     """Entry point for the game."""
     args = parse_arguments()
+    if args.spectate or args.replay:
+        args.cli = True
     
     # Import pygame only if using GUI mode
     if not args.cli:
@@ -25,21 +56,43 @@ def main():
     # Create the board
     board = Board()
     
+    telemetry = None
+    if args.telemetry:
+        telemetry = Telemetry(args.telemetry, interval=args.telemetry_interval)
+    
     # Create the appropriate UI
-    if args.cli:
-        ui = CliUI(board)
+    if args.replay:
+        CliUI(board, spectator=True, delay=args.delay, telemetry=telemetry).replay(args.replay)
+        if telemetry is not None:
+            telemetry.export()
+        return
+    elif args.spectate:
+        ui = CliUI(board, spectator=True, delay=args.delay, games=args.games, telemetry=telemetry)
+    elif args.cli:
+        ui = CliUI(board, telemetry=telemetry)
     else:
-        ui = GameUI(board) 
+        ui = GameUI(board, telemetry=telemetry)
+    
+    # Open the position cache shared by all games in this session
+    cache = None
+    if args.cache:
+        cache = PositionCache(args.cache, readonly=args.cache_readonly)
     
     # Main game loop with restart option
     play_again = True
     while play_again:
-        # Get difficulty from UI
-        difficulty = ui.show_difficulty_selection()
+        # Get difficulty from the command line or the UI
+        difficulty = args.difficulty
+        if difficulty is None:
+            difficulty = 'medium' if args.spectate else ui.show_difficulty_selection()
         
         # Create and start a new game
-        game = Game(ui, ai_difficulty=difficulty)
+        game = Game(ui, ai_difficulty=difficulty, ai_cache=cache, spectate=args.spectate,
+                    telemetry=telemetry)
         play_again = game.start()
+    
+    if cache is not None:
+        cache.close()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,142 @@
+from board import Board
+
+class Position:
+    """
+    Compact, immutable and hashable Connect Four position for the standard
+    6x7 board, meant for caches, opening books, search frontiers and logs.
+    The whole position is a single integer: each column takes ROWS + 1 bits
+    holding its player 1 pieces from the bottom up, plus a marker bit just
+    above the top piece. Player 1 always moves first, so the side to move
+    follows from the number of pieces, which is kept alongside the key.
+    """
+    __slots__ = ('key', 'moves')
+    
+    ROWS = 6
+    COLS = 7
+    HEIGHT = ROWS + 1  # Bits per column
+    COLUMN_MASK = (1 << HEIGHT) - 1
+    EMPTY_KEY = int(('0' * ROWS + '1') * COLS, 2)  # Only the markers
+    
+    def __init__(self, key=EMPTY_KEY, moves=None):
+        object.__setattr__(self, 'key', key)
+        if moves is None:
+            moves = sum(self.height(col) for col in range(self.COLS))
+        object.__setattr__(self, 'moves', moves)  # Number of pieces on the board
+    
+    def __setattr__(self, name, value):
+        raise AttributeError("Position is immutable")
+    
+    def __delattr__(self, name):
+        raise AttributeError("Position is immutable")
+    
+    def __eq__(self, other):
+        return isinstance(other, Position) and self.key == other.key
+    
+    def __hash__(self):
+        return hash(self.key)
+    
+    def __repr__(self):
+        return f"Position({self.key:#x})"
+    
+    def __reduce__(self):
+        return (Position, (self.key, self.moves))
+    
+    @classmethod
+    def from_board(cls, board):
+        """Creates a position from a Board with the standard dimensions."""
+        if board.rows != cls.ROWS or board.cols != cls.COLS:
+            raise ValueError(f"Position only supports {cls.ROWS}x{cls.COLS} boards")
+        key = 0
+        moves = 0
+        for col in range(cls.COLS):
+            code = 0
+            level = 0
+            for row in range(cls.ROWS - 1, -1, -1):
+                piece = board.board[row][col]
+                if piece == 0:
+                    break
+                if piece == 1:
+                    code |= 1 << level
+                level += 1
+            key |= (code | 1 << level) << (col * cls.HEIGHT)
+            moves += level
+        return cls(key, moves)
+    
+    @classmethod
+    def from_moves(cls, moves):
+        """
+        Creates a position by playing a sequence of 0-based columns from the
+        empty board. A string of 1-based digits such as "4453" is also accepted.
+        """
+        if isinstance(moves, str):
+            moves = [int(move) - 1 for move in moves]
+        position = cls()
+        for col in moves:
+            position = position.play(col)
+        return position
+    
+    def column(self, col):
+        """Returns the ROWS + 1 bits of a column, marker included."""
+        return (self.key >> (col * self.HEIGHT)) & self.COLUMN_MASK
+    
+    def height(self, col):
+        """Returns the number of pieces in a column."""
+        return self.column(col).bit_length() - 1
+    
+    @property
+    def current_player(self):
+        """The player to move next (1 or 2)."""
+        return 1 if self.moves % 2 == 0 else 2
+    
+    def can_play(self, col):
+        """Check if a piece can be dropped in the column."""
+        return 0 <= col < self.COLS and self.height(col) < self.ROWS
+    
+    def play(self, col):
+        """
+        Returns the position after the player to move drops a piece in col.
+        Raises ValueError if the column is full or out of range.
+        """
+        if not 0 <= col < self.COLS:
+            raise ValueError(f"Cannot play column {col}")
+        height = self.height(col)
+        if height >= self.ROWS:
+            raise ValueError(f"Cannot play column {col}")
+        # Adding 2 * marker sets a new marker and keeps the old one as a player 1
+        # piece; adding the marker itself carries it up, leaving a 0 (player 2)
+        marker = 1 << (col * self.HEIGHT + height)
+        if self.moves % 2 == 0:
+            return Position(self.key + 2 * marker, self.moves + 1)
+        return Position(self.key + marker, self.moves + 1)
+    
+    def mirror(self):
+        """Returns the position reflected left to right."""
+        return Position(self.mirror_key, self.moves)
+    
+    @property
+    def mirror_key(self):
+        """Key of the position reflected left to right."""
+        key = 0
+        for col in range(self.COLS):
+            key |= self.column(col) << ((self.COLS - 1 - col) * self.HEIGHT)
+        return key
+    
+    @property
+    def canonical_key(self):
+        """Key shared by the position and its mirror image."""
+        return min(self.key, self.mirror_key)
+    
+    def piece(self, row, col):
+        """Returns the piece at Board coordinates (row 0 at the top): 0, 1 or 2."""
+        level = self.ROWS - 1 - row
+        if level >= self.height(col):
+            return 0
+        return 1 if self.column(col) >> level & 1 else 2
+    
+    def to_board(self):
+        """Returns a new Board holding this position."""
+        board = Board(self.ROWS, self.COLS)
+        for col in range(self.COLS):
+            for level in range(self.height(col)):
+                board.board[self.ROWS - 1 - level][col] = 1 if self.column(col) >> level & 1 else 2
+        return board
@@ -0,0 +1,138 @@
+import bisect
+import json
+import os
+import time
+
+class Histogram:
+    """
+    Fixed-bucket histogram. Recording a value is a binary search and a few
+    additions, so it is cheap enough to call on every move and frame.
+    """
+    __slots__ = ('bounds', 'counts', 'sum', 'count', 'min', 'max')
+    
+    def __init__(self, bounds):
+        self.bounds = bounds  # Upper bounds of the buckets, ascending
+        self.counts = [0] * (len(bounds) + 1)  # Last bucket is +Inf
+        self.sum = 0.0
+        self.count = 0
+        self.min = None
+        self.max = None
+    
+    def observe(self, value):
+        """Records one value."""
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+    
+    def cumulative_counts(self):
+        """Returns (upper bound, count of values <= bound) pairs, ending with +Inf."""
+        pairs = []
+        total = 0
+        for bound, count in zip(self.bounds + [float('inf')], self.counts):
+            total += count
+            pairs.append((bound, total))
+        return pairs
+
+class Telemetry:
+    """
+    Collects game latency histograms (AI think time, frame times, game
+    duration) and exports them as JSON or Prometheus text format. Exports
+    happen at the end of every game and, if interval is set, at most every
+    interval seconds when a value is recorded.
+    """
+    PREFIX = 'connect_four_'
+    
+    # Bucket upper bounds, in seconds unless stated otherwise
+    TIME_BUCKETS = [0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1,
+                    0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 300.0]
+    BUCKETS = {
+        'ai_move_nodes': [10, 30, 100, 300, 1000, 3000, 6000, 10000, 30000],  # Positions searched
+        'game_seconds': [10.0, 30.0, 60.0, 120.0, 300.0, 600.0, 1800.0, 3600.0],
+    }
+    
+    HELP = {
+        'ai_move_seconds': 'Time the AI took to choose a move',
+        'ai_move_nodes': 'Positions the AI searched to choose a move',
+        'frame_seconds': 'Time spent drawing a frame or animation',
+        'game_seconds': 'Duration of a complete game',
+    }
+    
+    def __init__(self, path=None, interval=None):
+        self.path = path  # .json for JSON, anything else for Prometheus text
+        self.interval = interval  # Seconds between exports while playing
+        self.histograms = {}  # name -> {sorted label items -> Histogram}
+        self.last_export = time.monotonic()
+    
+    def observe(self, name, value, **labels):
+        """Records a value in the histogram for name and labels."""
+        series = self.histograms.setdefault(name, {})
+        key = tuple(sorted(labels.items()))
+        histogram = series.get(key)
+        if histogram is None:
+            histogram = series[key] = Histogram(self.BUCKETS.get(name, self.TIME_BUCKETS))
+        histogram.observe(value)
+        
+        if self.interval is not None and time.monotonic() - self.last_export >= self.interval:
+            self.export()
+    
+    @staticmethod
+    def ply_range(ply, size=6):
+        """Groups a move number into a label such as '6-11' to keep the series few."""
+        start = ply - ply % size
+        return f"{start}-{start + size - 1}"
+    
+    def to_dict(self):
+        """Returns every histogram as plain data, ready for JSON."""
+        metrics = {}
+        for name, series in sorted(self.histograms.items()):
+            metrics[name] = [{
+                'labels': dict(key),
+                'count': histogram.count,
+                'sum': histogram.sum,
+                'min': histogram.min,
+                'max': histogram.max,
+                'buckets': {('+Inf' if bound == float('inf') else repr(bound)): total
+                            for bound, total in histogram.cumulative_counts()},
+            } for key, histogram in sorted(series.items())]
+        return {'timestamp': time.time(), 'metrics': metrics}
+    
+    def to_json(self):
+        """Returns the histograms as a JSON document."""
+        return json.dumps(self.to_dict(), indent=2)
+    
+    def to_prometheus(self):
+        """Returns the histograms in the Prometheus text exposition format."""
+        lines = []
+        for name, series in sorted(self.histograms.items()):
+            metric = self.PREFIX + name
+            lines.append(f"# HELP {metric} {self.HELP.get(name, name)}")
+            lines.append(f"# TYPE {metric} histogram")
+            for key, histogram in sorted(series.items()):
+                labels = ",".join(f'{label}="{value}"' for label, value in key)
+                prefix = labels + "," if labels else ""
+                for bound, total in histogram.cumulative_counts():
+                    le = '+Inf' if bound == float('inf') else repr(bound)
+                    lines.append(f'{metric}_bucket{{{prefix}le="{le}"}} {total}')
+                suffix = "{" + labels + "}" if labels else ""
+                lines.append(f"{metric}_sum{suffix} {histogram.sum!r}")
+                lines.append(f"{metric}_count{suffix} {histogram.count}")
+        return "\n".join(lines) + "\n"
+    
+    def export(self, path=None):
+        """
+        Writes the histograms to path (or self.path). The file is replaced
+        atomically so readers such as a metrics collector never see half of it.
+        """
+        self.last_export = time.monotonic()
+        path = path or self.path
+        if path is None:
+            return
+        text = self.to_json() if path.endswith('.json') else self.to_prometheus()
+        temp_path = path + '.tmp'
+        with open(temp_path, 'w') as f:
+            f.write(text)
+        os.replace(temp_path, path)